@@ -0,0 +1,53 @@
+"""
+Module: Shared Script Configuration
+Description:
+    Provides the RubricLab YAML configurations through cached accessor functions:
+    courses() (courses.yml), assignments() (assignment.yml) and submissions()
+    (submissions.yml). Each file is parsed through config_loader on the first call and
+    the result is reused for the rest of the process, so a script only reads the files
+    it actually uses. If a file cannot be loaded the error is logged and the script exits.
+
+Usage:
+    import _config
+    for course_info in _config.courses():
+        ...
+"""
+
+import functools
+import logging
+
+from config_loader import load_yaml
+
+# Configuration file paths
+COURSES_FILE = "courses.yml"
+ASSIGNMENT_PARAMS_FILE = "assignment.yml"
+SUBMISSION_LIST = "submissions.yml"
+
+log = logging.getLogger(__name__)
+
+
+def _load(path):
+    """Load a configuration file, exiting the script if it cannot be read."""
+    try:
+        return load_yaml(path)
+    except Exception as e:
+        log.error(f"Failed to load {path}: {e}")
+        exit(1)
+
+
+@functools.cache
+def courses():
+    """Return the course list from courses.yml."""
+    return _load(COURSES_FILE)
+
+
+@functools.cache
+def assignments():
+    """Return the assignment definitions from assignment.yml."""
+    return _load(ASSIGNMENT_PARAMS_FILE)
+
+
+@functools.cache
+def submissions():
+    """Return the test user submissions from submissions.yml."""
+    return _load(SUBMISSION_LIST)
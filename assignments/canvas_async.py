@@ -0,0 +1,209 @@
+"""
+Module: Async Canvas API Client
+Description:
+    A minimal asyncio Canvas client built on aiohttp, covering the calls made by
+    generate_submissions.py. All requests share one aiohttp connector, so a single
+    thread can keep up to CONNECTION_LIMIT requests in flight against the Canvas host.
+    Throttled requests, transient server errors and transport errors are retried with
+    the same policy as the synchronous client in canvas_session, and failures raise
+    canvasapi's exceptions so that callers handle errors the same way on both paths.
+
+Prerequisites:
+    - The optional 'aiohttp' package installed. Scripts fall back to the threaded
+      canvasapi path when it is not available.
+
+Usage:
+    from canvas_async import AsyncCanvas
+    async with AsyncCanvas(CANVAS_API_URL, CANVAS_API_KEY) as client:
+        sections, assignments = await client.get_course_contents(course_id)
+"""
+
+import asyncio
+
+import aiohttp
+from canvasapi.exceptions import CanvasException, Forbidden, RateLimitExceeded
+
+from canvas_session import (
+    COURSE_CONTENTS_QUERY,
+    NON_IDEMPOTENT_METHODS,
+    RATE_LIMIT_MESSAGE,
+)
+
+# Connector settings for the shared aiohttp session
+CONNECTION_LIMIT = 64
+DNS_CACHE_TTL = 600
+
+# Retry settings, matching canvas_session.RETRY_POLICY
+MAX_RETRIES = 8
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncCanvas:
+    """An asyncio Canvas client, used as an async context manager."""
+
+    def __init__(self, api_url, api_key):
+        self.api_url = api_url.rstrip("/")
+        self.api_key = api_key
+        self._session = None
+        self._users = {}  # sis_login_id -> task resolving to the user
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT, ttl_dns_cache=DNS_CACHE_TTL
+            ),
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+
+    async def _request(self, method, url, **kwargs):
+        """
+        Issue a request, retrying rate-limited and transient errors with backoff.
+
+        Throttled requests (429, or Canvas's 403 "Rate Limit Exceeded") and connections
+        that could not be established are retried for every method. Transient 5xx
+        responses, dropped connections and timeouts are only retried for idempotent
+        methods, since Canvas may already have applied a POST that failed that way.
+        Transport errors left once retries run out are raised as CanvasException.
+        """
+        idempotent = method.upper() not in NON_IDEMPOTENT_METHODS
+        retry_statuses = RETRY_STATUSES if idempotent else {429}
+        for attempt in range(MAX_RETRIES + 1):
+            last_attempt = attempt == MAX_RETRIES
+            delay = BACKOFF_FACTOR * 2**attempt
+            try:
+                async with self._session.request(method, url, **kwargs) as response:
+                    throttled = response.status == 403 and (
+                        RATE_LIMIT_MESSAGE in await response.text()
+                    )
+                    if (
+                        response.status in retry_statuses or throttled
+                    ) and not last_attempt:
+                        try:
+                            delay = float(response.headers["Retry-After"])
+                        except (KeyError, ValueError):
+                            pass
+                    elif throttled:
+                        raise Forbidden(await response.text())
+                    elif response.status == 429:
+                        raise RateLimitExceeded(
+                            "Rate Limit Exceeded. X-Rate-Limit-Remaining: {}".format(
+                                response.headers.get("X-Rate-Limit-Remaining", "Unknown")
+                            )
+                        )
+                    elif response.status >= 400:
+                        raise CanvasException(
+                            f"Encountered an error: status code {response.status}: "
+                            f"{await response.text()}"
+                        )
+                    else:
+                        return await response.json()
+            except aiohttp.ContentTypeError as e:
+                raise CanvasException(f"Unexpected response from Canvas: {e}") from e
+            except aiohttp.ClientConnectorError as e:
+                # The connection was never established, so Canvas did not see the request
+                if last_attempt:
+                    raise CanvasException(f"Connection error: {e}") from e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not idempotent or last_attempt:
+                    raise CanvasException(
+                        f"Request failed: {type(e).__name__}: {e}"
+                    ) from e
+            await asyncio.sleep(delay)
+
+    async def rest(self, method, endpoint, **kwargs):
+        """Call a REST endpoint relative to /api/v1/ and return the decoded JSON."""
+        return await self._request(method, f"{self.api_url}/api/v1/{endpoint}", **kwargs)
+
+    async def graphql(self, query, variables=None):
+        """Run a GraphQL query and return its data, raising on GraphQL errors."""
+        result = await self._request(
+            "POST",
+            f"{self.api_url}/api/graphql",
+            json={"query": query, "variables": variables or {}},
+        )
+        if result.get("errors"):
+            raise CanvasException(f"GraphQL error: {result['errors']}")
+        return result.get("data") or {}
+
+    async def get_course_contents(self, course_id):
+        """
+        Return the sections and assignments of a course as lists of dicts.
+
+        Sections carry id and name; assignments additionally carry submission_types.
+        Uses the same paginated GraphQL query as canvas_session.get_course_contents().
+        """
+        sections, assignments = [], []
+        variables = {
+            "courseId": str(course_id),
+            "withSections": True,
+            "sectionsAfter": None,
+            "withAssignments": True,
+            "assignmentsAfter": None,
+        }
+
+        while variables["withSections"] or variables["withAssignments"]:
+            course = (await self.graphql(COURSE_CONTENTS_QUERY, variables)).get("course")
+            if course is None:
+                raise CanvasException(f"Course {course_id} not found")
+
+            if variables["withSections"]:
+                connection = course["sectionsConnection"]
+                for node in connection["nodes"]:
+                    sections.append({"id": int(node["_id"]), "name": node["name"]})
+                variables["withSections"] = connection["pageInfo"]["hasNextPage"]
+                variables["sectionsAfter"] = connection["pageInfo"]["endCursor"]
+
+            if variables["withAssignments"]:
+                connection = course["assignmentsConnection"]
+                for node in connection["nodes"]:
+                    assignments.append(
+                        {
+                            "id": int(node["_id"]),
+                            "name": node["name"],
+                            "submission_types": node["submissionTypes"] or [],
+                        }
+                    )
+                variables["withAssignments"] = connection["pageInfo"]["hasNextPage"]
+                variables["assignmentsAfter"] = connection["pageInfo"]["endCursor"]
+
+        return sections, assignments
+
+    async def get_user(self, sis_login_id):
+        """
+        Look up a user by SIS login ID.
+
+        Lookups are shared across callers, so each user is fetched once per client even
+        when many courses ask for it concurrently. Failed lookups are not cached.
+        """
+        task = self._users.get(sis_login_id)
+        if task is None:
+            task = asyncio.ensure_future(
+                self.rest("GET", f"users/sis_login_id:{sis_login_id}")
+            )
+            self._users[sis_login_id] = task
+        try:
+            return await task
+        except CanvasException:
+            self._users.pop(sis_login_id, None)
+            raise
+
+    async def enroll_user(self, section_id, user_id, enrollment):
+        """Enroll a user in a course section."""
+        return await self.rest(
+            "POST",
+            f"sections/{section_id}/enrollments",
+            json={"enrollment": dict(enrollment, user_id=user_id)},
+        )
+
+    async def submit(self, course_id, assignment_id, submission):
+        """Make a submission to an assignment on behalf of submission['user_id']."""
+        return await self.rest(
+            "POST",
+            f"courses/{course_id}/assignments/{assignment_id}/submissions",
+            json={"submission": submission},
+        )
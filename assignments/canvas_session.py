@@ -0,0 +1,232 @@
+"""
+Module: Shared Canvas API Client
+Description:
+    Builds the Canvas API client used by the RubricLab scripts. The client's underlying
+    HTTP session is replaced with a keep-alive session so that every call made against
+    the Canvas host reuses one pooled TCP/TLS connection instead of opening a new one.
+    Throttled requests are retried for every method; transient server errors only for
+    idempotent ones, so a POST that Canvas may already have applied is never resent.
+
+Usage:
+    from canvas_session import make_canvas
+    canvas = make_canvas(CANVAS_API_URL, CANVAS_API_KEY)
+
+    Scripts fan courses out over MAX_COURSE_WORKERS threads, and each course's
+    per-item requests over MAX_TASK_WORKERS threads.
+
+    get_course_contents() lists a course's sections and assignments through the Canvas
+    GraphQL endpoint, fetching both collections in a single round-trip per page instead
+    of paging through the two REST listings separately.
+"""
+
+import random
+import time
+
+import requests
+from canvasapi import Canvas
+from canvasapi.assignment import Assignment
+from canvasapi.exceptions import CanvasException, Forbidden, RateLimitExceeded
+from canvasapi.requester import Requester
+from canvasapi.section import Section
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pool settings for the shared HTTP session. The pool blocks once all
+# connections are in use, which also caps the number of requests in flight.
+POOL_MAXSIZE = 64
+
+# Methods whose requests may already have been applied by Canvas when a 5xx or a read
+# error comes back; retrying those could create a second assignment or submission.
+NON_IDEMPOTENT_METHODS = frozenset(["POST", "PATCH"])
+
+
+class CanvasRetry(Retry):
+    """
+    Retry policy that also retries non-idempotent methods, but only on HTTP 429.
+
+    A 429 means Canvas rejected the request before processing it, so resending is safe
+    for any method. Transient 5xx responses and read errors are only retried for the
+    idempotent methods listed in allowed_methods.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() in NON_IDEMPOTENT_METHODS:
+            return status_code == 429 and bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+# Retry rate-limited and transient server errors, honouring Canvas's Retry-After
+# header. Once retries are exhausted the last response is handed back to canvasapi so
+# that it raises its usual CanvasException subclass.
+RETRY_POLICY = CanvasRetry(
+    total=8,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["GET", "PUT", "DELETE"]),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# Canvas throttles with "403 Forbidden (Rate Limit Exceeded)", which canvasapi raises
+# as Forbidden. Such requests were not processed and are retried for every method.
+RATE_LIMIT_MESSAGE = "Rate Limit Exceeded"
+RATE_LIMIT_RETRIES = 8
+RATE_LIMIT_BACKOFF = 0.5
+
+# Number of courses processed concurrently by the scripts
+MAX_COURSE_WORKERS = 8
+
+# Number of enrollments/submissions issued concurrently within a single course
+MAX_TASK_WORKERS = 16
+
+# GraphQL query listing a course's sections and assignments. Either connection can be
+# skipped so that further pages are only requested for the one that still has more.
+# Without a filter, assignmentsConnection only returns the current grading period;
+# a null gradingPeriodId asks for the assignments of every period.
+COURSE_CONTENTS_QUERY = """
+query CourseContents(
+  $courseId: ID!
+  $withSections: Boolean!
+  $sectionsAfter: String
+  $withAssignments: Boolean!
+  $assignmentsAfter: String
+) {
+  course(id: $courseId) {
+    sectionsConnection(first: 100, after: $sectionsAfter) @include(if: $withSections) {
+      nodes { _id name }
+      pageInfo { hasNextPage endCursor }
+    }
+    assignmentsConnection(
+      first: 100
+      after: $assignmentsAfter
+      filter: { gradingPeriodId: null }
+    ) @include(if: $withAssignments) {
+      nodes { _id name submissionTypes }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+
+def make_session():
+    """Return a requests session with a pooled, retrying adapter mounted for HTTPS."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=True,
+        max_retries=RETRY_POLICY,
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+class ThrottledRequester(Requester):
+    """Requester that backs off and retries requests throttled with a 403 by Canvas."""
+
+    def request(
+        self,
+        method,
+        endpoint=None,
+        headers=None,
+        use_auth=True,
+        _url=None,
+        _kwargs=None,
+        json=False,
+        **kwargs,
+    ):
+        # canvasapi mutates headers and _kwargs in place, so pass fresh copies each time
+        original_kwargs = list(_kwargs or [])
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                return super().request(
+                    method,
+                    endpoint,
+                    headers=dict(headers or {}),
+                    use_auth=use_auth,
+                    _url=_url,
+                    _kwargs=list(original_kwargs),
+                    json=json,
+                    **kwargs,
+                )
+            except RateLimitExceeded:
+                # A 429, already retried by RETRY_POLICY at the adapter level
+                raise
+            except Forbidden as e:
+                if RATE_LIMIT_MESSAGE not in str(e) or attempt == RATE_LIMIT_RETRIES:
+                    raise
+                # Jitter spreads out the retries of throttled worker threads
+                time.sleep(RATE_LIMIT_BACKOFF * 2**attempt * random.uniform(1, 2))
+
+
+def make_canvas(api_url, api_key):
+    """
+    Return a Canvas instance that retries throttled requests and uses the shared
+    keep-alive session.
+    """
+    canvas = Canvas(api_url, api_key)
+    requester = canvas._Canvas__requester
+    canvas._Canvas__requester = ThrottledRequester(
+        requester.original_url, requester.access_token
+    )
+    canvas._Canvas__requester._session = make_session()
+    return canvas
+
+
+def get_course_contents(canvas, course_id):
+    """
+    Return the sections and assignments of a course as canvasapi objects.
+
+    Both collections are fetched with one GraphQL request per page. The returned
+    Section and Assignment objects carry the attributes the scripts rely on (id, name,
+    course_id and, for assignments, submission_types) and can issue REST calls as usual.
+    """
+    requester = canvas._Canvas__requester
+    sections, assignments = [], []
+    variables = {
+        "courseId": str(course_id),
+        "withSections": True,
+        "sectionsAfter": None,
+        "withAssignments": True,
+        "assignmentsAfter": None,
+    }
+
+    while variables["withSections"] or variables["withAssignments"]:
+        result = canvas.graphql(COURSE_CONTENTS_QUERY, variables=variables)
+        if result.get("errors"):
+            raise CanvasException(f"GraphQL error: {result['errors']}")
+        course = (result.get("data") or {}).get("course")
+        if course is None:
+            raise CanvasException(f"Course {course_id} not found")
+
+        if variables["withSections"]:
+            connection = course["sectionsConnection"]
+            for node in connection["nodes"]:
+                sections.append(
+                    Section(
+                        requester,
+                        {"id": int(node["_id"]), "name": node["name"], "course_id": course_id},
+                    )
+                )
+            variables["withSections"] = connection["pageInfo"]["hasNextPage"]
+            variables["sectionsAfter"] = connection["pageInfo"]["endCursor"]
+
+        if variables["withAssignments"]:
+            connection = course["assignmentsConnection"]
+            for node in connection["nodes"]:
+                assignments.append(
+                    Assignment(
+                        requester,
+                        {
+                            "id": int(node["_id"]),
+                            "name": node["name"],
+                            "course_id": course_id,
+                            "submission_types": node["submissionTypes"] or [],
+                        },
+                    )
+                )
+            variables["withAssignments"] = connection["pageInfo"]["hasNextPage"]
+            variables["assignmentsAfter"] = connection["pageInfo"]["endCursor"]
+
+    return sections, assignments
@@ -0,0 +1,52 @@
+"""
+Module: Completed Operation Log
+Description:
+    Records idempotency keys of Canvas operations that have completed successfully in a
+    local log file, one key per line. Scripts check the log before repeating a
+    non-idempotent call (such as submitting an assignment) so that a rerun after a
+    failure or rate-limit storm skips work that was already done instead of
+    duplicating it. Keys are appended as they complete, so recording one costs a single
+    short write regardless of how many keys the log already holds.
+
+Usage:
+    from completed_log import CompletedLog, idempotency_key
+    log = CompletedLog("submissions-completed.log")
+    key = idempotency_key(course.id, assignment.id, sis_login_id)
+    if key not in log:
+        ...
+        log.add(key)
+"""
+
+import hashlib
+import threading
+
+
+def idempotency_key(*parts):
+    """Return a stable key identifying an operation by its parts."""
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class CompletedLog:
+    """A thread-safe set of completed operation keys persisted to an append-only file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r") as file:
+                self._keys = {line.strip() for line in file if line.strip()}
+        except FileNotFoundError:
+            self._keys = set()
+        # Line buffered, so every recorded key reaches the file as soon as it is added
+        self._file = open(path, "a", buffering=1)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._keys
+
+    def add(self, key):
+        """Record key as completed by appending it to the log file."""
+        with self._lock:
+            if key not in self._keys:
+                self._keys.add(key)
+                self._file.write(f"{key}\n")
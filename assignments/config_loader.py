@@ -0,0 +1,111 @@
+"""
+Module: YAML Configuration Loader
+Description:
+    Loads the RubricLab YAML configuration files (courses.yml, assignment.yml,
+    submissions.yml) and keeps the parsed result in a small in-process LRU cache.
+    Cache entries are keyed by file path and validated against the file's modification
+    time and size, so a file is only parsed again once it has changed on disk.
+    Files are parsed with the safe loader, backed by libyaml when it is available.
+
+    Each parsed file is also written to a JSON sidecar next to it (<file>.cache.json),
+    together with the YAML file's modification time (in nanoseconds) and size. Later
+    runs load the sidecar instead of parsing the YAML again, but only while both values
+    still match the YAML file exactly, so a replaced file is re-parsed even when it
+    carries an older timestamp.
+
+Usage:
+    from config_loader import load_yaml
+    course_list = load_yaml("courses.yml")
+"""
+
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import yaml
+
+# Prefer the C-accelerated libyaml loader and fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Maximum number of parsed files kept in the cache
+CACHE_SIZE = 100
+
+# Suffix of the JSON sidecar written next to each YAML file
+SIDECAR_SUFFIX = ".cache.json"
+
+_cache = OrderedDict()  # path -> (mtime_ns, size, data)
+_cache_lock = threading.Lock()
+
+
+def load_yaml(path):
+    """
+    Return the parsed contents of the YAML file at path.
+
+    Callers receive a deep copy of the cached data and are free to modify it.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[:2] == key:
+            _cache.move_to_end(path)
+            return copy.deepcopy(cached[2])
+
+    data = _load_uncached(path, st)
+
+    with _cache_lock:
+        _cache[path] = (*key, data)
+        _cache.move_to_end(path)
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return copy.deepcopy(data)
+
+
+def _load_uncached(path, st):
+    """
+    Load path from its JSON sidecar if it was written for the file described by st
+    (an os.stat result), otherwise parse the YAML.
+    """
+    sidecar = path + SIDECAR_SUFFIX
+    try:
+        with open(sidecar, "r") as file:
+            cached = json.load(file)
+        if cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            return cached["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    with open(path, "r") as file:
+        data = yaml.load(file, Loader=SafeLoader)
+
+    # Best effort: data that JSON cannot represent exactly (e.g. dates, or non-string
+    # mapping keys that JSON would turn into strings) or an unwritable directory simply
+    # mean the next run parses the YAML again.
+    try:
+        encoded = json.dumps(
+            {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data}
+        )
+    except (TypeError, ValueError):
+        return data
+    if json.loads(encoded)["data"] != data:
+        return data
+
+    tmp_path = f"{sidecar}.tmp"
+    try:
+        with open(tmp_path, "w") as file:
+            file.write(encoded)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    return data
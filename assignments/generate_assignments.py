@@ -28,15 +28,23 @@ Note:
     Assumes sufficient permissions for assignment creation and rubric association via the provided API key.
 """
 
-import yaml
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from canvasapi import Canvas
 from canvasapi.exceptions import CanvasException
+import _config
+from canvas_session import (
+    MAX_COURSE_WORKERS,
+    MAX_TASK_WORKERS,
+    get_course_contents,
+    make_canvas,
+)
+from log_setup import configure_logging
 
-# Configuration file paths
-ASSIGNMENT_PARAMS_FILE = "assignment.yml"
-COURSES_FILE = "courses.yml"
+# Report progress through logging so lines from concurrent workers stay intact
+configure_logging()
+log = logging.getLogger(__name__)
 
 # Load and verify API access environment variables
 load_dotenv()
@@ -44,72 +52,90 @@ CANVAS_API_KEY = os.environ.get("CANVAS_API_KEY")
 CANVAS_API_URL = os.environ.get("CANVAS_API_URL")
 
 if not CANVAS_API_URL or not CANVAS_API_KEY:
-    print(
+    log.error(
         "Error: Canvas API URL or API Key not set. Please check your environment variables."
     )
     exit(1)
 
-# Load course and assignment configurations from YAML files
-try:
-    with open(COURSES_FILE, "r") as file:
-        course_list = yaml.load(file, Loader=yaml.FullLoader)
-except Exception as e:
-    print(f"Failed to load courses configuration: {e}")
-    exit(1)
+# Initialize Canvas API
+canvas = make_canvas(CANVAS_API_URL, CANVAS_API_KEY)
 
-try:
-    with open(ASSIGNMENT_PARAMS_FILE, "r") as file:
-        assignment_list = yaml.load(file, Loader=yaml.FullLoader)
-except Exception as e:
-    print(f"Failed to load assignment configuration: {e}")
-    exit(1)
 
-# Initialize Canvas API
-canvas = Canvas(CANVAS_API_URL, CANVAS_API_KEY)
+def associate_rubric(course, assignment_name, rubric_association, course_name):
+    """Associate a newly created assignment with its rubric."""
+    try:
+        course.create_rubric_association(rubric_association=rubric_association)
+        log.info(f"Associated rubric with: {assignment_name} in {course_name}")
+    except Exception as e:
+        # Runs on a pool thread whose future is not awaited, so report every failure
+        # here rather than letting it vanish with the future
+        log.error(
+            f"Error associating rubric with {assignment_name} in {course_name}: {e}"
+        )
 
-# Process each course for assignment creation
-for course_info in course_list:
+
+def process_course(course_info, canvas, assignment_list):
+    """Create the required sections and assignments for a single course."""
     try:
         course = canvas.get_course(course_info["canvas_id"])
 
+        # Fetch existing sections and assignments together in one GraphQL round-trip
+        sections, assignments = get_course_contents(canvas, course.id)
+
         # Ensure necessary sections exist and create them if not
         # Enhances clarity on section handling before assignment creation
         required_sections = [
             course_info.get("test_student_section_name", "Test Students"),
             course_info.get("grader_section_name", "Graders"),
         ]
-        existing_sections = {section.name: section for section in course.get_sections()}
+        existing_sections = {section.name: section for section in sections}
 
         for section_name in required_sections:
             if section_name not in existing_sections:
                 course.create_course_section(course_section={"name": section_name})
-                print(f"Created section: {section_name} in {course_info['name']}")
+                log.info(f"Created section: {section_name} in {course_info['name']}")
 
-        # Create assignments as specified, avoiding duplicates
-        existing_assignments = [
-            assignment.name for assignment in course.get_assignments()
-        ]
-        for assignment in assignment_list:
-            for i in range(1, course_info.get("num_create_assignments", 1) + 1):
-                assignment_name = f"{assignment.get('name', 'Assignment')}{i}"
-                if assignment_name not in existing_assignments:
-                    assignment_params = assignment.get("params", {}).copy()
-                    assignment_params["name"] = assignment_name
-                    new_assignment = course.create_assignment(
-                        assignment=assignment_params
-                    )
-                    # Associate with a rubric if specified
-                    if "rubric_id" in assignment:
-                        course.create_rubric_association(
-                            rubric_association={
-                                "rubric_id": assignment["rubric_id"],
-                                "association_id": new_assignment.id,
-                                "use_for_grading": True,
-                                "association_type": "Assignment",
-                                "purpose": "grading",
-                                "bookmarked": False,
-                            }
+        # Create assignments as specified, avoiding duplicates. Each rubric association
+        # is handed to the pool as soon as its assignment exists, so it overlaps with the
+        # remaining creates and still completes if a later create fails.
+        existing_assignments = {assignment.name for assignment in assignments}
+        with ThreadPoolExecutor(max_workers=MAX_TASK_WORKERS) as executor:
+            for assignment in assignment_list:
+                for i in range(1, course_info.get("num_create_assignments", 1) + 1):
+                    assignment_name = f"{assignment.get('name', 'Assignment')}{i}"
+                    if assignment_name not in existing_assignments:
+                        assignment_params = assignment.get("params", {}).copy()
+                        assignment_params["name"] = assignment_name
+                        new_assignment = course.create_assignment(
+                            assignment=assignment_params
                         )
-                    print(f"Created: {assignment_name} in {course_info['name']}")
+                        existing_assignments.add(assignment_name)
+                        log.info(f"Created: {assignment_name} in {course_info['name']}")
+                        # Associate with a rubric if specified
+                        if "rubric_id" in assignment:
+                            executor.submit(
+                                associate_rubric,
+                                course,
+                                assignment_name,
+                                {
+                                    "rubric_id": assignment["rubric_id"],
+                                    "association_id": new_assignment.id,
+                                    "use_for_grading": True,
+                                    "association_type": "Assignment",
+                                    "purpose": "grading",
+                                    "bookmarked": False,
+                                },
+                                course_info["name"],
+                            )
     except Exception as e:
-        print(f"An error occurred with {course_info['name']}: {e}")
+        log.error(f"An error occurred with {course_info['name']}: {e}")
+
+
+# Process courses concurrently for assignment creation
+with ThreadPoolExecutor(max_workers=MAX_COURSE_WORKERS) as executor:
+    futures = [
+        executor.submit(process_course, course_info, canvas, _config.assignments())
+        for course_info in _config.courses()
+    ]
+    for future in as_completed(futures):
+        future.result()
@@ -14,6 +14,8 @@ Key Operations:
     - Validates environment variables for Canvas API access.
     - Loads course details from `courses.yml` and submission details from `submissions.yml`.
     - For each course, attempts to enroll specified test users and submit assignments of a defined type.
+    - Set CANVAS_ASYNC=1 to run all requests on one asyncio event loop (requires `aiohttp`).
+    - Records completed submissions in `submissions-completed.log` so reruns do not submit twice.
 
 Usage:
     1. Install necessary Python packages.
@@ -26,103 +28,299 @@ Safety and Permissions:
     - Ensure the provided API key has permissions to perform these operations.
 """
 
-import yaml
+import asyncio
+import itertools
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from canvasapi import Canvas
 from canvasapi.exceptions import CanvasException
+from completed_log import CompletedLog, idempotency_key
+import _config
+from canvas_session import (
+    MAX_COURSE_WORKERS,
+    MAX_TASK_WORKERS,
+    get_course_contents,
+    make_canvas,
+)
+from log_setup import configure_logging
+
+# The asyncio client is optional and only used when aiohttp is installed
+try:
+    from canvas_async import AsyncCanvas
+except ImportError:
+    AsyncCanvas = None
+
+# Report progress through logging so lines from concurrent workers stay intact
+configure_logging()
+log = logging.getLogger(__name__)
 
 # Constants for the script
 ASSIGNMENT_TYPE = "online_text_entry"  # Specify the type of assignment to submit
-COURSES_FILE = "courses.yml"  # Path to YAML file with course details
-SUBMISSION_LIST = "submissions.yml"  # Path to YAML file with submission details
+COMPLETED_LOG_FILE = "submissions-completed.log"  # Log of submissions already made
 
 # Load environment variables for Canvas API access
 load_dotenv()
 CANVAS_API_KEY = os.environ.get("CANVAS_API_KEY")
 CANVAS_API_URL = os.environ.get("CANVAS_API_URL")
 
+# Opt in to the asyncio/aiohttp client instead of the threaded canvasapi path
+USE_ASYNC = os.environ.get("CANVAS_ASYNC", "").lower() in ("1", "true", "yes")
+
 # Validate environment variables
 if not CANVAS_API_URL or not CANVAS_API_KEY:
-    print("Error: Canvas API URL or API Key not set. Check your environment variables.")
+    log.error("Error: Canvas API URL or API Key not set. Check your environment variables.")
     exit(1)
 
-# Load courses and submissions from YAML files
-try:
-    with open(COURSES_FILE, "r") as file:
-        course_list = yaml.load(file, Loader=yaml.FullLoader)
-except Exception as e:
-    print(f"Failed to load courses file: {e}")
-    exit(1)
+# Initialize Canvas API instance
+canvas = make_canvas(CANVAS_API_URL, CANVAS_API_KEY)
 
-try:
-    with open(SUBMISSION_LIST, "r") as file:
-        submission_list = yaml.load(file, Loader=yaml.FullLoader)
-except Exception as e:
-    print(f"Failed to load submissions file: {e}")
-    exit(1)
+# Submissions completed by earlier runs are skipped rather than submitted again
+completed_log = CompletedLog(COMPLETED_LOG_FILE)
 
-# Initialize Canvas API instance
-canvas = Canvas(CANVAS_API_URL, CANVAS_API_KEY)
 
-# Main operation: Enroll test users and submit assignments
-for course_info in course_list:
+def get_test_users(canvas, submission_list):
+    """
+    Look up every test user by SIS login ID, once per run and before any course is
+    processed, so concurrently processed courses never repeat the same lookup.
+
+    Returns a dict mapping SIS login ID to user. Users that cannot be found are logged
+    and left out.
+    """
+
+    def lookup(sis_login_id):
+        try:
+            return sis_login_id, canvas.get_user(sis_login_id, id_type="sis_login_id")
+        except CanvasException as e:
+            log.error(f"Error looking up user {sis_login_id}: {e}")
+            return sis_login_id, None
+
+    sis_login_ids = {submission_info["sis_login_id"] for submission_info in submission_list}
+    with ThreadPoolExecutor(max_workers=MAX_TASK_WORKERS) as executor:
+        return {
+            sis_login_id: user
+            for sis_login_id, user in executor.map(lookup, sis_login_ids)
+            if user
+        }
+
+
+def enroll_test_user(section, user, submission_info, course_name):
+    """
+    Enroll one test user in the given section.
+
+    Returns a (sis_login_id, submission_params) pair with the user's Canvas ID filled in,
+    or None if the user could not be enrolled.
+    """
+    try:
+        # Enroll the user in the test student section if not already enrolled
+        section.enroll_user(
+            user,
+            enrollment={
+                "type": "StudentEnrollment",
+                "enrollment_state": "active",
+            },
+        )
+        log.info(f"Enrolled {user} in section: {section.name}")
+
+        # Update submission parameters with the user ID for assignment submission
+        return submission_info["sis_login_id"], dict(
+            submission_info["submission_params"], user_id=user.id
+        )
+    except CanvasException as e:
+        log.error(
+            f"Error processing user {submission_info['sis_login_id']} in {course_name}: {e}"
+        )
+        return None
+
+
+def submit_for_user(assignment, sis_login_id, params, course_name):
+    """Submit one assignment on behalf of an enrolled test user, unless already done."""
+    key = idempotency_key(assignment.course_id, assignment.id, sis_login_id)
+    if key in completed_log:
+        log.info(f"Already submitted {assignment.name} for {sis_login_id} in {course_name}")
+        return
+    try:
+        assignment.submit(submission=params)
+        completed_log.add(key)
+        log.info(f"Submitted {assignment.name} for {sis_login_id} in {course_name}")
+    except CanvasException as e:
+        log.error(
+            f"Error submitting assignment for {sis_login_id} in {course_name}: {e}"
+        )
+
+
+def process_course(course_info, canvas, submission_list, users):
+    """Enroll the test users in a single course and submit its assignments for them."""
     try:
         # Retrieve the course by its Canvas ID
         course = canvas.get_course(course_info["canvas_id"])
 
+        # Fetch sections and assignments together in one GraphQL round-trip
+        sections, assignments = get_course_contents(canvas, course.id)
+
         # Attempt to find or assert the existence of a specific section for test students
-        test_student_section = next(
-            (
-                section
-                for section in course.get_sections()
-                if section.name == course_info.get("test_student_section_name")
-            ),
-            None,
+        sections_by_name = {section.name: section for section in sections}
+        test_student_section = sections_by_name.get(
+            course_info.get("test_student_section_name")
         )
         if not test_student_section:
-            print(f"No test student section found in course: {course_info['name']}.")
-            continue
-
-        # Enroll users and prepare for submission
-        for submission_info in submission_list:
-            try:
-                # Get the user by SIS login ID and enroll in the test student section if not already enrolled
-                user = canvas.get_user(
-                    submission_info["sis_login_id"], id_type="sis_login_id"
+            log.warning(f"No test student section found in course: {course_info['name']}.")
+            return
+
+        # Enroll users concurrently and collect the submission parameters for this
+        # course, keyed by SIS login ID. Built per course so that concurrently processed
+        # courses never share mutable state. Users that could not be looked up are
+        # skipped; the lookup failure has already been reported.
+        with ThreadPoolExecutor(max_workers=MAX_TASK_WORKERS) as executor:
+            enrolled = executor.map(
+                lambda submission_info: enroll_test_user(
+                    test_student_section,
+                    users[submission_info["sis_login_id"]],
+                    submission_info,
+                    course_info["name"],
+                ),
+                [
+                    submission_info
+                    for submission_info in submission_list
+                    if submission_info["sis_login_id"] in users
+                ],
+            )
+            submission_params = dict(item for item in enrolled if item)
+
+        # Select the assignments of the targeted type once per course
+        matching_assignments = [
+            assignment
+            for assignment in assignments
+            if ASSIGNMENT_TYPE in assignment.submission_types
+        ]
+
+        # Submit assignments for enrolled test users concurrently
+        with ThreadPoolExecutor(max_workers=MAX_TASK_WORKERS) as executor:
+            list(
+                executor.map(
+                    lambda pair: submit_for_user(pair[0], *pair[1], course_info["name"]),
+                    itertools.product(matching_assignments, submission_params.items()),
                 )
-                enrollment = test_student_section.enroll_user(
-                    user,
-                    enrollment={
-                        "type": "StudentEnrollment",
-                        "enrollment_state": "active",
-                    },
+            )
+
+    except CanvasException as e:
+        log.error(f"Error processing course {course_info['name']}: {e}")
+
+
+async def enroll_test_user_async(client, section, submission_info, course_name):
+    """Async counterpart of enroll_test_user(), using the aiohttp client."""
+    try:
+        user = await client.get_user(submission_info["sis_login_id"])
+        await client.enroll_user(
+            section["id"],
+            user["id"],
+            {
+                "type": "StudentEnrollment",
+                "enrollment_state": "active",
+            },
+        )
+        log.info(f"Enrolled {user['name']} ({user['id']}) in section: {section['name']}")
+
+        return submission_info["sis_login_id"], dict(
+            submission_info["submission_params"], user_id=user["id"]
+        )
+    except CanvasException as e:
+        log.error(
+            f"Error processing user {submission_info['sis_login_id']} in {course_name}: {e}"
+        )
+        return None
+
+
+async def submit_for_user_async(
+    client, course_id, assignment, sis_login_id, params, course_name
+):
+    """Async counterpart of submit_for_user(), using the aiohttp client."""
+    key = idempotency_key(course_id, assignment["id"], sis_login_id)
+    if key in completed_log:
+        log.info(f"Already submitted {assignment['name']} for {sis_login_id} in {course_name}")
+        return
+    try:
+        await client.submit(course_id, assignment["id"], params)
+        completed_log.add(key)
+        log.info(f"Submitted {assignment['name']} for {sis_login_id} in {course_name}")
+    except CanvasException as e:
+        log.error(
+            f"Error submitting assignment for {sis_login_id} in {course_name}: {e}"
+        )
+
+
+async def process_course_async(course_info, client, submission_list):
+    """Async counterpart of process_course(), issuing all requests on one event loop."""
+    course_id = course_info["canvas_id"]
+    course_name = course_info["name"]
+    try:
+        sections, assignments = await client.get_course_contents(course_id)
+
+        sections_by_name = {section["name"]: section for section in sections}
+        test_student_section = sections_by_name.get(
+            course_info.get("test_student_section_name")
+        )
+        if not test_student_section:
+            log.warning(f"No test student section found in course: {course_name}.")
+            return
+
+        enrolled = await asyncio.gather(
+            *[
+                enroll_test_user_async(
+                    client, test_student_section, submission_info, course_name
                 )
-                print(f"Enrolled {user} in section: {test_student_section.name}")
+                for submission_info in submission_list
+            ]
+        )
+        submission_params = dict(item for item in enrolled if item)
+
+        matching_assignments = [
+            assignment
+            for assignment in assignments
+            if ASSIGNMENT_TYPE in assignment["submission_types"]
+        ]
 
-                # Update submission parameters with the user ID for assignment submission
-                submission_info["submission_params"]["user_id"] = user.id
-            except CanvasException as e:
-                print(
-                    f"Error processing user {submission_info['sis_login_id']} in {course_info['name']}: {e}"
+        await asyncio.gather(
+            *[
+                submit_for_user_async(
+                    client, course_id, assignment, sis_login_id, params, course_name
                 )
-                continue
-
-        # Submit assignments for enrolled test users
-        for assignment in course.get_assignments():
-            if ASSIGNMENT_TYPE in assignment.submission_types:
-                for submission_info in submission_list:
-                    try:
-                        assignment.submit(
-                            submission=submission_info["submission_params"]
-                        )
-                        print(
-                            f"Submitted {assignment.name} for {submission_info['sis_login_id']} in {course_info['name']}"
-                        )
-                    except CanvasException as e:
-                        print(
-                            f"Error submitting assignment for {submission_info['sis_login_id']} in {course_info['name']}: {e}"
-                        )
+                for assignment, (sis_login_id, params) in itertools.product(
+                    matching_assignments, submission_params.items()
+                )
+            ]
+        )
 
     except CanvasException as e:
-        print(f"Error processing course {course_info['name']}: {e}")
+        log.error(f"Error processing course {course_name}: {e}")
+
+
+async def main_async():
+    """Process every course concurrently on a single event loop."""
+    async with AsyncCanvas(CANVAS_API_URL, CANVAS_API_KEY) as client:
+        await asyncio.gather(
+            *[
+                process_course_async(course_info, client, _config.submissions())
+                for course_info in _config.courses()
+            ]
+        )
+
+
+if USE_ASYNC and AsyncCanvas is None:
+    log.warning("CANVAS_ASYNC is set but aiohttp is not installed; using threads.")
+
+if USE_ASYNC and AsyncCanvas is not None:
+    # Main operation: Enroll test users and submit assignments on the event loop
+    asyncio.run(main_async())
+else:
+    # Resolve the test users once, then enroll them and submit, one course per worker
+    users = get_test_users(canvas, _config.submissions())
+    with ThreadPoolExecutor(max_workers=MAX_COURSE_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                process_course, course_info, canvas, _config.submissions(), users
+            )
+            for course_info in _config.courses()
+        ]
+        for future in as_completed(futures):
+            future.result()
@@ -0,0 +1,24 @@
+"""
+Module: Script Logging Setup
+Description:
+    Configures logging for the RubricLab scripts. Progress and errors from concurrent
+    workers are written through a single handler, so each message is emitted as a whole
+    line tagged with its time, level and worker thread.
+
+Usage:
+    from log_setup import configure_logging
+    configure_logging()
+"""
+
+import logging
+
+
+def configure_logging():
+    """Send INFO-level progress messages to stderr, tagged with time, level and thread."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(threadName)s %(message)s",
+        handlers=[logging.StreamHandler()],
+    )
+    # canvasapi logs every request at INFO; keep only its warnings and errors
+    logging.getLogger("canvasapi").setLevel(logging.WARNING)
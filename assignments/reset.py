@@ -21,15 +21,22 @@ Usage:
     python reset_course.py
 """
 
-import yaml
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from canvasapi import Canvas
 from canvasapi.exceptions import CanvasException
+import _config
+from canvas_session import (
+    MAX_COURSE_WORKERS,
+    MAX_TASK_WORKERS,
+    make_canvas,
+)
+from log_setup import configure_logging
 
-# Configuration file paths
-ASSIGNMENT_PARAMS_FILE = "assignment.yml"
-COURSES_FILE = "courses.yml"
+# Report progress through logging so lines from concurrent workers stay intact
+configure_logging()
+log = logging.getLogger(__name__)
 
 # Load environment variables for API access
 load_dotenv()
@@ -38,24 +45,26 @@ CANVAS_API_URL = os.environ.get("CANVAS_API_URL")
 
 # Check for required environment variables
 if not CANVAS_API_URL or not CANVAS_API_KEY:
-    print(
+    log.error(
         "Error: Required environment variables (CANVAS_API_URL, CANVAS_API_KEY) are not set."
     )
     exit(1)
 
-# Load course list from courses.yml
-try:
-    with open(COURSES_FILE, "r") as file:
-        course_list = yaml.load(file, Loader=yaml.FullLoader)
-except Exception as e:
-    print(f"Error loading {COURSES_FILE}: {e}")
-    exit(1)
-
 # Initialize Canvas API
-canvas = Canvas(CANVAS_API_URL, CANVAS_API_KEY)
+canvas = make_canvas(CANVAS_API_URL, CANVAS_API_KEY)
+
+
+def delete_enrollment(enrollment):
+    """Delete a single enrollment, returning the error instead of raising it."""
+    try:
+        enrollment.deactivate(task="delete")
+    except CanvasException as e:
+        return e
+    return None
 
-# Iterate through courses for cleanup
-for course_info in course_list:
+
+def process_course(course_info, canvas, assignment_list):
+    """Remove generated assignments, test enrollments and sections from a single course."""
     course_canvas_id = course_info["canvas_id"]
     course_name = course_info["name"]
 
@@ -63,45 +72,75 @@ for course_info in course_list:
     try:
         course = canvas.get_course(course_canvas_id)
     except CanvasException as e:
-        print(f"Skipping {course_name} due to error: {e}")
-        continue
+        log.warning(f"Skipping {course_name} due to error: {e}")
+        return
 
-    # Load assignments to be deleted
-    try:
-        with open(ASSIGNMENT_PARAMS_FILE, "r") as file:
-            assignment_list = yaml.load(file, Loader=yaml.FullLoader)
-    except Exception as e:
-        print(f"Error loading {ASSIGNMENT_PARAMS_FILE}: {e}")
-        exit(1)
-
-    # Compile a list of assignment names to delete
-    assignments_to_delete = [
+    # Compile a set of assignment names to delete
+    assignments_to_delete = {
         f"{a.get('name', 'Assignment')}{i}"
         for a in assignment_list
         for i in range(1, course_info.get("num_create_assignments", 1) + 1)
-    ]
+    }
+
+    # Find specified assignments, narrowing each listing server-side by base name.
+    # Canvas rejects search terms shorter than two characters, so fall back to the
+    # full listing if any base name is that short.
+    base_names = {a.get("name", "Assignment") for a in assignment_list}
+    if all(len(base_name) >= 2 for base_name in base_names):
+        listings = [
+            course.get_assignments(search_term=base_name, per_page=100)
+            for base_name in base_names
+        ]
+    else:
+        listings = [course.get_assignments(per_page=100)]
+    # Keyed by ID since one assignment can match more than one search term
+    matching_assignments = {
+        assignment.id: assignment
+        for listing in listings
+        for assignment in listing
+        if assignment.name in assignments_to_delete
+    }
 
     # Delete specified assignments
-    for assignment in course.get_assignments():
-        if assignment.name in assignments_to_delete:
-            try:
-                assignment.delete()
-                print(f"Deleted assignment: {assignment.name} from {course_name}")
-            except CanvasException as e:
-                print(f"Error deleting assignment {assignment.name}: {e}")
+    for assignment in matching_assignments.values():
+        try:
+            assignment.delete()
+            log.info(f"Deleted assignment: {assignment.name} from {course_name}")
+        except CanvasException as e:
+            log.error(f"Error deleting assignment {assignment.name}: {e}")
 
     # Delete specified sections and their enrollments
-    for section in course.get_sections():
+    for section in course.get_sections(per_page=100):
         if section.name in [
             course_info.get("test_student_section_name", "Test Students"),
             course_info.get("grader_section_name", "Graders"),
         ]:
             try:
-                # Deactivate section enrollments
-                for enrollment in section.get_enrollments():
-                    enrollment.deactivate(task="delete")
+                # Deactivate section enrollments concurrently, collecting failures
+                enrollments = list(section.get_enrollments(per_page=100))
+                with ThreadPoolExecutor(max_workers=MAX_TASK_WORKERS) as executor:
+                    errors = [
+                        error
+                        for error in executor.map(delete_enrollment, enrollments)
+                        if error
+                    ]
+                if errors:
+                    for error in errors:
+                        log.error(f"Error deleting enrollment in {section.name}: {error}")
+                    log.warning(f"Skipped deleting section: {section.name} from {course_name}")
+                    continue
                 # Delete the section
                 section.delete()
-                print(f"Deleted section: {section.name} from {course_name}")
+                log.info(f"Deleted section: {section.name} from {course_name}")
             except CanvasException as e:
-                print(f"Error processing section {section.name}: {e}")
+                log.error(f"Error processing section {section.name}: {e}")
+
+
+# Clean up courses concurrently
+with ThreadPoolExecutor(max_workers=MAX_COURSE_WORKERS) as executor:
+    futures = [
+        executor.submit(process_course, course_info, canvas, _config.assignments())
+        for course_info in _config.courses()
+    ]
+    for future in as_completed(futures):
+        future.result()